@@ -73,15 +73,15 @@ hide_streamlit_style = """
 st.markdown(hide_streamlit_style, unsafe_allow_html=True)
 
 
-import pandas as pd
+import numpy as np
 from io import BytesIO
-from pptx import Presentation
-from pptx.util import Pt
-from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
+import math
+import os
 import re
+import zipfile
+from copy import deepcopy
 from datetime import datetime, timedelta
-import time
-import importlib.util
+from functools import lru_cache
 
 # app.py
 import drive
@@ -90,14 +90,70 @@ import drive
 # Import num2words from number-to-words.py
 from number_to_words import num2words
 
-with open("app/style.css") as css:
-    st.markdown(f'<style>{css.read()}</style>', unsafe_allow_html=True)
+@st.cache_data
+def _load_css(path="app/style.css"):
+    with open(path) as css:
+        return css.read()
+
+st.markdown(f'<style>{_load_css()}</style>', unsafe_allow_html=True)
+
+@st.cache_resource(max_entries=4)
+def _read_template(template_path, mtime):
+    with open(template_path, "rb") as f:
+        return f.read()
+
+def _load_template_bytes(template_path):
+    """
+    Raw .pptx template bytes, read once per file version; callers reopen it
+    from memory. Keyed on mtime so a replaced template is picked up without
+    restarting the server.
+    """
+    return _read_template(template_path, os.path.getmtime(template_path))
+
+def _save_with_template_parts(template_path, changed_parts):
+    """
+    Write the template package back out, swapping in only the changed parts.
+    Untouched parts (masters, themes, fonts, media) are copied from the
+    template's bytes rather than re-serialized from python-pptx objects by
+    prs.save(); DEFLATE entries are still inflated and re-deflated, only
+    STORED entries are copied as-is.
+    """
+    out = BytesIO()
+    with zipfile.ZipFile(BytesIO(_load_template_bytes(template_path))) as src, \
+            zipfile.ZipFile(out, "w") as dst:
+        for info in src.infolist():
+            blob = changed_parts.get(info.filename)
+            # DEFLATE level 1: several times faster than the default 6 for a
+            # few percent more bytes; STORED entries (fonts, images) stay stored
+            dst.writestr(
+                info, blob if blob is not None else src.read(info), compresslevel=1
+            )
+    return out
 
 # ──────────────────────────────────────────────────────────────────────────────
 #  Helper: Fill PPTX template with invoice data (finding tables by alt_text)
 # ──────────────────────────────────────────────────────────────────────────────
 def generate_filled_invoice(rows, template_path, bill_info, payment_method, amount_in_words):
-    prs = Presentation(template_path)
+    """
+    Return the filled invoice as a BytesIO. The result is a pure function of
+    the inputs and the template file, so repeat clicks with unchanged data are
+    served from cache; the template's mtime is part of the key. The cache
+    holds plain bytes, wrapped in a fresh BytesIO for each caller.
+    """
+    return BytesIO(_fill_invoice(
+        rows, template_path, os.path.getmtime(template_path),
+        bill_info, payment_method, amount_in_words,
+    ))
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _fill_invoice(rows, template_path, template_mtime, bill_info, payment_method, amount_in_words):
+    # python-pptx (and lxml) are only needed once the user hits Generate
+    from pptx import Presentation
+    from pptx.util import Pt
+    from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
+    from pptx.oxml.ns import qn
+
+    prs = Presentation(BytesIO(_load_template_bytes(template_path)))
     slide = prs.slides[0]
 
     # Fill text boxes (titles + values)
@@ -121,26 +177,6 @@ def generate_filled_invoice(rows, template_path, bill_info, payment_method, amou
         "Client Phone Number": "Phone: ",
         "Client Email": "Email ID: ",
     }
-    for shape in slide.shapes:
-        if shape.has_text_frame:
-            name = getattr(shape, "name", "")
-            if name in text_fields and name in field_titles:
-                value = str(text_fields[name])
-                if name == "Client Address":
-                    value = value[:65]
-                shape.text_frame.clear()
-                p = shape.text_frame.paragraphs[0]
-                run_title = p.add_run()
-                run_title.text = field_titles[name]
-                run_title.font.bold = True
-                run_title.font.name = "Poppins"
-                run_title.font.size = Pt(12)
-                run_value = p.add_run()
-                run_value.text = value
-                run_value.font.bold = False
-                run_value.font.name = "Poppins"
-                run_value.font.size = Pt(12)
-                shape.text_frame.vertical_anchor = MSO_ANCHOR.MIDDLE
 
     # Handle Payment Method Checkboxes
     checkbox_names = {
@@ -149,41 +185,90 @@ def generate_filled_invoice(rows, template_path, bill_info, payment_method, amou
         "**UPI**": "UPI Check",
         "**Cheque**": "Cheque Check",
     }
-    for shape in slide.shapes:
-        if shape.has_text_frame:
-            name = getattr(shape, "name", "")
-            if name in checkbox_names.values():
-                if name == checkbox_names.get(payment_method):
-                    shape.text = "✔"
-                    # Center align horizontally and vertically
-                    shape.text_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
-                    shape.text_frame.vertical_anchor = MSO_ANCHOR.MIDDLE
-                    # Optionally set font for tick
-                    for run in shape.text_frame.paragraphs[0].runs:
-                        run.font.name = "Poppins"
-                        run.font.size = Pt(12)  # Adjust size as needed
-                else:
-                    shape.text = ""
 
-    # Fill tables (LineItems and BillingSummary)
-    line_table = None
-    summary_table = None
+    # Compute Subtotal, Rounding, Net Payable. Rows arrive validated, with
+    # Amount (₹) already formatted as "1234.50", so float() cannot fail
+    subtotal = math.fsum(float(row_data["Amount (₹)"]) for row_data in rows)
+    rounded_total = float(round(subtotal))
+    rounding_value = rounded_total - subtotal
+    net_payable = rounded_total
+
+    def fill_text_field(shape):
+        name = shape.name
+        value = str(text_fields[name])
+        if name == "Client Address":
+            value = value[:65]
+        shape.text_frame.clear()
+        p = shape.text_frame.paragraphs[0]
+        run_title = p.add_run()
+        run_title.text = field_titles[name]
+        run_title.font.bold = True
+        run_title.font.name = "Poppins"
+        run_title.font.size = Pt(12)
+        run_value = p.add_run()
+        run_value.text = value
+        run_value.font.bold = False
+        run_value.font.name = "Poppins"
+        run_value.font.size = Pt(12)
+        shape.text_frame.vertical_anchor = MSO_ANCHOR.MIDDLE
+
+    def fill_checkbox(shape):
+        if shape.name == checkbox_names.get(payment_method):
+            shape.text = "✔"
+            # Center align horizontally and vertically
+            shape.text_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
+            shape.text_frame.vertical_anchor = MSO_ANCHOR.MIDDLE
+            # Optionally set font for tick
+            for run in shape.text_frame.paragraphs[0].runs:
+                run.font.name = "Poppins"
+                run.font.size = Pt(12)  # Adjust size as needed
+        else:
+            shape.text = ""
+
+    def fill_amount_in_words(shape):
+        shape.text_frame.clear()
+        p = shape.text_frame.paragraphs[0]
+        run = p.add_run()
+        run.text = amount_in_words
+        run.font.name = "Poppins"
+        run.font.size = Pt(11)
+        run.font.italic = True
+        p.alignment = PP_ALIGN.CENTER  # Optional: center align text
+        shape.text_frame.vertical_anchor = MSO_ANCHOR.MIDDLE
+
+    # One pass over the slide: text boxes are filled as they are met,
+    # tables are collected and filled below.
+    text_handlers = {name: fill_text_field for name in text_fields if name in field_titles}
+    text_handlers.update({name: fill_checkbox for name in checkbox_names.values()})
+    text_handlers["Amount In Words"] = fill_amount_in_words
+
+    tables = {}
     for shape in slide.shapes:
+        name = shape.name
         if shape.has_table:
-            if getattr(shape, "name", "") == "LineItems":
-                line_table = shape.table
-            elif getattr(shape, "name", "") == "BillingSummary":
-                summary_table = shape.table
+            if name in ("LineItems", "BillingSummary"):
+                tables[name] = shape.table
+        elif shape.has_text_frame:
+            handler = text_handlers.get(name)
+            if handler:
+                handler(shape)
 
+    # Fill tables (LineItems and BillingSummary)
+    line_table = tables.get("LineItems")
+    summary_table = tables.get("BillingSummary")
     if line_table is None or summary_table is None:
         raise Exception("Could not find LineItems or BillingSummary table in template.")
 
+    # Resolve every cell once; .rows[i].cells[j] re-walks the table XML
+    line_cells = [list(row.cells) for row in line_table.rows]
+    summary_cells = [list(row.cells) for row in summary_table.rows]
+
     # Get font style from first data cell
-    max_rows = len(line_table.rows)
+    max_rows = len(line_cells)
     if max_rows > 1:
-        sample_cell = line_table.rows[1].cells[0]
+        sample_cell = line_cells[1][0]
     else:
-        sample_cell = line_table.rows[0].cells[0]
+        sample_cell = line_cells[0][0]
     sample_para = sample_cell.text_frame.paragraphs[0]
     sample_run = sample_para.runs[0] if sample_para.runs else None
     if sample_run:
@@ -192,24 +277,35 @@ def generate_filled_invoice(rows, template_path, bill_info, payment_method, amou
     else:
         base_font_name = "Poppins"
         base_font_size = Pt(12)
-
-    # Clear existing data rows (rows 1…end), leave row 0 intact
-    available_data_rows = max_rows - 1
-    for r_idx in range(1, max_rows):
-        for c_idx in range(len(line_table.columns)):
-            cell = line_table.rows[r_idx].cells[c_idx]
-            cell.text = ""
-            para = cell.text_frame.paragraphs[0]
-            run = para.add_run()
-            run.font.name = base_font_name
-            run.font.size = base_font_size
-            para.alignment = PP_ALIGN.CENTER
+    # Pre-styled <a:p> that every table cell write clones; one deepcopy per
+    # cell replaces the python-pptx run/font setters. It starts as a copy of
+    # the sample paragraph, so the template's paragraph formatting carries
+    # over, trimmed to a single centred run in the base font.
+    cell_p = deepcopy(sample_para._p)
+    for extra in cell_p.xpath("./a:r[position() > 1] | ./a:br | ./a:fld"):
+        cell_p.remove(extra)
+    cell_p.get_or_add_pPr().algn = PP_ALIGN.CENTER
+    template_r = cell_p.r_lst[0] if cell_p.r_lst else cell_p.add_r()
+    template_r.t.text = ""
+    template_rPr = template_r.get_or_add_rPr()
+    template_rPr.sz = base_font_size.centipoints
+    template_rPr.get_or_add_latin().typeface = base_font_name
+    a_p, a_t = qn("a:p"), qn("a:t")
+
+    def write_cell(cell, txt):
+        tx_body = cell._tc.get_or_add_txBody()
+        for old_p in tx_body.findall(a_p):
+            tx_body.remove(old_p)
+        new_p = deepcopy(cell_p)
+        new_p.find(f".//{a_t}").text = txt
+        tx_body.append(new_p)
 
     # Write each data row into rows 1…up to available_data_rows
+    available_data_rows = max_rows - 1
     rows_to_fill = min(len(rows), available_data_rows)
     for i in range(rows_to_fill):
         row_data = rows[i]
-        target_row = line_table.rows[i + 1]  # +1 to skip header
+        target_row = line_cells[i + 1]  # +1 to skip header
         for col_idx, key in enumerate(
             ["No.", "Item Description", "Weight", "Rate (₹)", "Amount (₹)"]
         ):
@@ -222,87 +318,214 @@ def generate_filled_invoice(rows, template_path, bill_info, payment_method, amou
                     txt = str(value)
             else:
                 txt = str(value) if value is not None else ""
-            cell = target_row.cells[col_idx]
-            cell.text = ""
-            para = cell.text_frame.paragraphs[0]
-            run = para.add_run()
-            run.text = txt
-            run.font.name = base_font_name
-            run.font.size = base_font_size
-            para.alignment = PP_ALIGN.CENTER
-
-    # Compute Subtotal, Rounding, Net Payable
-    amounts = []
-    for row_data in rows:
-        amt = pd.to_numeric(row_data.get("Amount (₹)", 0), errors="coerce")
-        if pd.isna(amt):
-            amt = 0.0
-        amounts.append(float(amt))
-    subtotal = sum(amounts)
-    rounded_total = float(round(subtotal))
-    rounding_value = rounded_total - subtotal
-    net_payable = rounded_total
+            write_cell(target_row[col_idx], txt)
 
-    # Get amount in words
-    amount_in_words = "Rupees " + num2words(net_payable) + " Only."
+    # Clear the leftover rows below the data (row 0 is the header); filled
+    # rows were overwritten above, so every cell is written at most once
+    for r_idx in range(rows_to_fill + 1, max_rows):
+        for cell in line_cells[r_idx]:
+            if cell.text_frame.text:
+                write_cell(cell, "")
 
     # Fill BillingSummary table (row 1: Subtotal, row 2: Rounding, row 3: NET PAYABLE)
-    def set_summary_cell(r_idx, value, prefix=""):
-        cell = summary_table.rows[r_idx].cells[1]
-        cell.text = ""
-        para = cell.text_frame.paragraphs[0]
-        run = para.add_run()
-        run.text = f"{prefix}{value:,.2f}"
-        run.font.name = base_font_name
-        run.font.size = base_font_size
-        para.alignment = PP_ALIGN.CENTER
-
-    set_summary_cell(1, subtotal)
-    set_summary_cell(2, rounding_value)
-    set_summary_cell(3, net_payable, prefix="₹ ")
-
-    # Write Amount In Words to the selection pane text box
-    for shape in slide.shapes:
-        if shape.has_text_frame and getattr(shape, "name", "") == "Amount In Words":
-            shape.text_frame.clear()
-            p = shape.text_frame.paragraphs[0]
-            run = p.add_run()
-            run.text = amount_in_words
-            run.font.name = "Poppins"
-            run.font.size = Pt(11)
-            run.font.italic = True
-            p.alignment = PP_ALIGN.CENTER  # Optional: center align text
-            shape.text_frame.vertical_anchor = MSO_ANCHOR.MIDDLE
-
-    # Save PPTX to memory
-    out = BytesIO()
-    prs.save(out)
+    for r_idx, value, prefix in (
+        (1, subtotal, ""),
+        (2, rounding_value, ""),
+        (3, net_payable, "₹ "),
+    ):
+        write_cell(summary_cells[r_idx][1], f"{prefix}{value:,.2f}")
+
+    # Save PPTX to memory; only the slide XML has changed. st.cache_data
+    # pickles the return value, so hand it plain bytes rather than a buffer.
+    out = _save_with_template_parts(
+        template_path, {slide.part.partname.lstrip("/"): slide.part.blob}
+    )
     return out.getvalue()
 
 
 # ──────────────────────────────────────────────────────────────────────────────
 #  Streamlit App
 # ──────────────────────────────────────────────────────────────────────────────
-def parse_number(val):
+# Thousands separators and the rupee sign, stripped before float()
+_STRIP_TABLE = str.maketrans("", "", ",₹")
+# Plain decimal numbers: 12, -3, 1.25, .5, 7.
+_NUMBER_RE = re.compile(r"[+-]?(?:\d+\.?\d*|\.\d+)")
+
+def _clean_number(val):
+    """Drop commas, the rupee sign, an Rs/Rs. marker and surrounding whitespace from val."""
+    s = str(val).translate(_STRIP_TABLE).strip()
+    # "Rs" / "Rs." may be written before or after the number
+    low = s.lower()
+    if low.startswith("rs"):
+        s = s[3:] if low.startswith("rs.") else s[2:]
+    elif low.endswith("rs"):
+        s = s[:-2]
+    elif low.endswith("rs."):
+        s = s[:-3]
+    return s.strip()
+
+@lru_cache(maxsize=512)
+def _parse_or_nan(val):
     """
-    Parse a number from a string, stripping spaces, commas, Rs, ₹, etc.
-    Returns float or raises ValueError.
+    Parse a number from a string, stripping commas, Rs, ₹, etc. Returns a
+    float, or NaN for blank or non-numeric values. Checks with the regex
+    instead of catching float()'s exception, since invalid cells are routine
+    while a user is still filling rows. Memoized: each Generate re-parses
+    every cell, and most are unchanged since the last.
     """
     if val is None:
-        raise ValueError("Empty value")
-    s = str(val)
-    s = s.replace(",", "")
-    s = re.sub(r"(rs\.?|₹)", "", s, flags=re.IGNORECASE)
-    s = s.strip()
-    if not s:
-        raise ValueError("Empty value")
-    return float(s)
+        return np.nan
+    s = _clean_number(val)
+    return float(s) if _NUMBER_RE.fullmatch(s) else np.nan
+
+def _add_row():
+    st.session_state.rows.append(
+        {
+            "No.": "",
+            "Item Description": "",
+            "Weight": "",
+            "Rate (₹)": "",
+            "Amount (₹)": "",
+        }
+    )
 
-@st.cache_data
-def slow_function():
-    import time
-    time.sleep(2)  # Simulating a slow operation
-    return "Result from slow_function"
+@st.fragment
+def line_items_editor():
+    """
+    Line-item cards, the Generate Invoice button and the Add Another Row
+    button. Runs as a fragment so adding a row redraws only this block, not
+    the whole page.
+    """
+    rows = st.session_state.rows
+
+    st.markdown("---")
+
+    # Row inputs live in a form, so typing in them does not rerun anything
+    # until Generate Invoice submits the whole form at once. Enter must not
+    # submit it: a submit uploads the invoice to Drive
+    with st.form("invoice", enter_to_submit=False, border=False):
+        # Always use vertical card per line item, with label above each input (responsive & clear)
+        for idx in range(len(rows)):
+            with st.container():
+                # Labels and spacers between two widgets go out as one markdown element
+                # Card-like background for each line item, then the No. label
+                st.markdown(
+                    f'<div class="heading" style="margin-bottom:0.7rem;">Line Item {idx+1}</div>'
+                    '<div class="label-bold">No. (positive integer)</div>',
+                    unsafe_allow_html=True,
+                )
+                default_no = rows[idx]["No."] if rows[idx]["No."] else str(idx + 1)
+                st.text_input(
+                    label="No. (positive integer)",
+                    value=default_no,
+                    placeholder=str(idx + 1),
+                    key=f"No_{idx}",
+                    label_visibility="collapsed",
+                    disabled=True,  # Make it read-only
+                )
+
+                # Item Description
+                st.markdown(
+                    "<div style='height: 0.3rem'></div>"
+                    '<div class="label-bold">Item Description (required)</div>',
+                    unsafe_allow_html=True,
+                )
+                st.text_input(
+                    label="Item Description (required)",
+                    value=rows[idx]["Item Description"],
+                    placeholder="Diamond Ring, Necklace…",
+                    key=f"Desc_{idx}",
+                    label_visibility="collapsed",
+                )
+
+                # Per-row Weight Unit. A new row starts on the previous row's
+                # unit as of the last Generate: form widgets only commit on
+                # submit, so an unsubmitted carats/gms change is not seen here
+                prev_unit = rows[idx-1]["Weight Unit"] if idx > 0 and "Weight Unit" in rows[idx-1] else "**carats**"
+                st.markdown(
+                    "<div style='height: 0.3rem'></div>"
+                    '<div class="label-bold">Weight Unit</div>',
+                    unsafe_allow_html=True,
+                )
+                weight_unit = st.radio(
+                    f"Select Weight Unit for Row {idx+1}:",
+                    options=["**carats**", "**gms**"],
+                    index=0 if rows[idx].get("Weight Unit", prev_unit).replace("**", "") == "carats" else 1,
+                    key=f"weight_unit_{idx}",
+                    label_visibility="collapsed",
+                    horizontal=True,
+                )
+                # Remove ** from weight unit for display
+                weight_unit = weight_unit.replace("**", "")
+
+                # Weight input (show unit)
+                st.markdown(f'<div class="label-bold">Weight ({weight_unit}, non-negative)</div>', unsafe_allow_html=True)
+                st.text_input(
+                    label=f"Weight ({weight_unit}, non-negative)",
+                    value=rows[idx]["Weight"],
+                    placeholder=f"e.g. 1.25",
+                    key=f"Weight_{idx}",
+                    label_visibility="collapsed",
+                )
+
+                # Rate (₹)
+                st.markdown(
+                    "<div style='height: 0.3rem'></div>"
+                    '<div class="label-bold">Rate (₹) (non-negative)</div>',
+                    unsafe_allow_html=True,
+                )
+                st.text_input(
+                    label="Rate (₹) (non-negative)",
+                    value=rows[idx]["Rate (₹)"],
+                    placeholder="e.g. 45000",
+                    key=f"Rate_{idx}",
+                    label_visibility="collapsed",
+                )
+
+                # Amount (₹) is Weight × Rate, worked out once when the invoice is
+                # generated; here it only shows the last computed value
+                st.markdown(
+                    "<div style='height: 0.3rem'></div>"
+                    '<div class="label-bold">Amount (₹) (calculated on Generate)</div>'
+                    f'<div>{rows[idx]["Amount (₹)"]}</div>',
+                    unsafe_allow_html=True,
+                )
+
+        st.markdown("---")
+
+        # Centered, stacked buttons
+        center_col = st.columns([3, 2, 3])[1]
+        with center_col:
+            submitted = st.form_submit_button("![icon](https://raw.githubusercontent.com/kingrishabdugar/RishabGems/refs/heads/main/diamond-1.gif) **Generate Invoice**", use_container_width=True)
+
+    if submitted:
+        # Form values are only committed on submit, so copy them into the
+        # rows here, once, straight from the widget keys
+        for idx, row in enumerate(rows):
+            row["No."] = st.session_state[f"No_{idx}"]
+            row["Item Description"] = st.session_state[f"Desc_{idx}"]
+            row["Weight"] = st.session_state[f"Weight_{idx}"]
+            row["Rate (₹)"] = st.session_state[f"Rate_{idx}"]
+            row["Weight Unit"] = st.session_state[f"weight_unit_{idx}"].replace("**", "")
+            # Amount shown under the row, set before the rerun so it matches
+            # this Generate; blank until Weight and Rate are both valid
+            weight = _parse_or_nan(row["Weight"])
+            rate = _parse_or_nan(row["Rate (₹)"])
+            # isfinite() rules out unparsable (NaN) and overflowing values
+            if math.isfinite(weight) and math.isfinite(rate) and weight >= 0 and rate >= 0:
+                row["Amount (₹)"] = f"{weight * rate:.2f}"
+            else:
+                row["Amount (₹)"] = ""
+        # The invoice is built by main(), so hand over to a full app rerun
+        st.session_state["generate_requested"] = True
+        st.rerun()
+
+    # Add Another Row has to sit outside the form to take effect immediately.
+    # The callback appends before the fragment reruns, so no st.rerun() is needed
+    center_col = st.columns([3, 2, 3])[1]
+    with center_col:
+        st.markdown("<div style='height: 0.5rem'></div>", unsafe_allow_html=True)  # Small vertical gap
+        st.button("![icon](https://raw.githubusercontent.com/kingrishabdugar/RishabGems/refs/heads/main/diamond-1.gif) **Add Another Row**", use_container_width=True, on_click=_add_row)
 
 def main():
     # --- Minimalistic Login ---
@@ -331,8 +554,7 @@ def main():
             """,
             unsafe_allow_html=True,
         )
-        with open("app/style.css") as css:
-            st.markdown(f'<style>{css.read()}</style>', unsafe_allow_html=True)
+        st.markdown(f'<style>{_load_css()}</style>', unsafe_allow_html=True)
         pin = st.text_input(
             "PIN",  # Non-empty label for accessibility
             type="password",
@@ -450,8 +672,7 @@ def main():
 
     # ── NEW: Payment Method Section ──
     st.markdown('<div class="heading">Payment Method</div>', unsafe_allow_html=True)
-    if "payment_method" not in st.session_state:
-        st.session_state["payment_method"] = "**Cash**"
+    st.session_state.setdefault("payment_method", "**Cash**")
     
     st.markdown('<div class="subheading">Select Payment Method:</div>', unsafe_allow_html=True)
     payment_method = st.radio(
@@ -463,204 +684,63 @@ def main():
     )
 
     # Initialize session-state rows
-    if "rows" not in st.session_state:
-        st.session_state.rows = [
-            {"No.": "", "Item Description": "", "Weight": "", "Rate (₹)": "", "Amount (₹)": ""}
-        ]
-
-    rows = st.session_state.rows
-
-    st.markdown("---")
-
-    # Always use vertical card per line item, with label above each input (responsive & clear)
-    for idx in range(len(rows)):
-        with st.container():
-            # Card-like background for each line item
-            st.markdown(f'<div class="heading" style="margin-bottom:0.7rem;">Line Item {idx+1}</div>', unsafe_allow_html=True)
-
-            # No.
-            st.markdown('<div class="label-bold">No. (positive integer)</div>', unsafe_allow_html=True)
-            default_no = rows[idx]["No."] if rows[idx]["No."] else str(idx + 1)
-            no_val = st.text_input(
-                label="No. (positive integer)",
-                value=default_no,
-                placeholder=str(idx + 1),
-                key=f"No_{idx}",
-                label_visibility="collapsed",
-                disabled=True,  # Make it read-only
-            )
-            st.markdown("<div style='height: 0.3rem'></div>", unsafe_allow_html=True)
-
-            # Item Description
-            st.markdown('<div class="label-bold">Item Description (required)</div>', unsafe_allow_html=True)
-            desc_val = st.text_input(
-                label="Item Description (required)",
-                value=rows[idx]["Item Description"],
-                placeholder="Diamond Ring, Necklace…",
-                key=f"Desc_{idx}",
-                label_visibility="collapsed",
-            )
-            st.markdown("<div style='height: 0.3rem'></div>", unsafe_allow_html=True)
-
-            # Per-row Weight Unit
-            prev_unit = rows[idx-1]["Weight Unit"] if idx > 0 and "Weight Unit" in rows[idx-1] else "**carats**"
-            st.markdown('<div class="label-bold">Weight Unit</div>', unsafe_allow_html=True)
-            weight_unit = st.radio(
-                f"Select Weight Unit for Row {idx+1}:",
-                options=["**carats**", "**gms**"],
-                index=0 if rows[idx].get("Weight Unit", prev_unit).replace("**", "") == "carats" else 1,
-                key=f"weight_unit_{idx}",
-                label_visibility="collapsed",
-                horizontal=True,
-            )
-            # Save the selected unit for this row
-            # Remove ** from weight unit for storage
-            weight_unit = weight_unit.replace("**", "")
-            rows[idx]["Weight Unit"] = weight_unit
-
-            # Weight input (show unit)
-            st.markdown(f'<div class="label-bold">Weight ({weight_unit}, non-negative)</div>', unsafe_allow_html=True)
-            weight_val = st.text_input(
-                label=f"Weight ({weight_unit}, non-negative)",
-                value=rows[idx]["Weight"],
-                placeholder=f"e.g. 1.25",
-                key=f"Weight_{idx}",
-                label_visibility="collapsed",
-            )
-            st.markdown("<div style='height: 0.3rem'></div>", unsafe_allow_html=True)
-
-            # Rate (₹)
-            st.markdown('<div class="label-bold">Rate (₹) (non-negative)</div>', unsafe_allow_html=True)
-            rate_val = st.text_input(
-                label="Rate (₹) (non-negative)",
-                value=rows[idx]["Rate (₹)"],
-                placeholder="e.g. 45000",
-                key=f"Rate_{idx}",
-                label_visibility="collapsed",
-            )
-            st.markdown("<div style='height: 0.3rem'></div>", unsafe_allow_html=True)  # Add spacing after Rate
-
-            # --- Auto-calculate Amount ---
-            try:
-                w = float(weight_val)
-                r = float(rate_val)
-                auto_amount = f"{w * r:.2f}"
-            except Exception:
-                auto_amount = ""
-
-            # Always auto-calculate and overwrite Amount (₹)
-            amount_val = auto_amount
-
-            # Amount (₹) (auto-calculated)
-            st.markdown('<div class="label-bold">Amount (₹) (auto-calculated)</div>', unsafe_allow_html=True)
-            st.text_input(
-                label="Amount (₹) (auto-calculated)",
-                value=amount_val,
-                placeholder=auto_amount,
-                key=f"Amount_{idx}",
-                label_visibility="collapsed",
-                disabled=False,  # Make it read-only
-            )
-
-            # Save back to session state
-            st.session_state.rows[idx]["No."] = no_val
-            st.session_state.rows[idx]["Item Description"] = desc_val
-            st.session_state.rows[idx]["Weight"] = weight_val
-            st.session_state.rows[idx]["Rate (₹)"] = rate_val
-            st.session_state.rows[idx]["Amount (₹)"] = amount_val
-            st.session_state.rows[idx]["Weight Unit"] = weight_unit
+    st.session_state.setdefault(
+        "rows",
+        [{"No.": "", "Item Description": "", "Weight": "", "Rate (₹)": "", "Amount (₹)": ""}],
+    )
 
-    st.markdown("---")
-
-    # Centered, stacked buttons
-    center_col = st.columns([3, 2, 3])[1]
-    with center_col:
-        if st.button("![icon](https://raw.githubusercontent.com/kingrishabdugar/RishabGems/refs/heads/main/diamond-1.gif) **Add Another Row**", use_container_width=True):
-            st.session_state.rows.append(
-                {
-                    "No.": "",
-                    "Item Description": "",
-                    "Weight": "",
-                    "Rate (₹)": "",
-                    "Amount (₹)": "",
-                }
-            )
-            st.rerun()
-        st.markdown("<div style='height: 0.5rem'></div>", unsafe_allow_html=True)  # Small vertical gap
-        generate_button = st.button("![icon](https://raw.githubusercontent.com/kingrishabdugar/RishabGems/refs/heads/main/diamond-1.gif) **Generate Invoice**", use_container_width=True)
+    line_items_editor()
+    generate_button = st.session_state.pop("generate_requested", False)
 
     # When “Generate Invoice” is clicked:
     if generate_button:
         # 1) Filter out fully blank rows
-        filtered_rows = []
-        for r in st.session_state.rows:
-            if any(str(v).strip() != "" for v in r.values()):
-                filtered_rows.append(r.copy())
+        filtered_rows = [
+            r for r in st.session_state.rows if any(str(v).strip() for v in r.values())
+        ]
 
         if not filtered_rows:
             st.error("No data entered. Please fill at least one line item before generating the invoice.")
             return
 
-        # 2) Stricter validation
+        # 2) Stricter validation. Each numeric column is parsed once into a
+        #    float64 array (unparsable cells become NaN) and checked as a whole;
+        #    messages are only built for the rows that fail.
+        n = len(filtered_rows)
+
+        def parse_column(key):
+            return np.fromiter(
+                (_parse_or_nan(r[key]) for r in filtered_rows), dtype=np.float64, count=n
+            )
+
+        nos = np.trunc(parse_column("No."))
+        weights = parse_column("Weight")
+        rates = parse_column("Rate (₹)")
+        has_desc = np.fromiter(
+            (bool(str(r["Item Description"]).strip()) for r in filtered_rows), dtype=bool, count=n
+        )
+
+        # NaN compares False, so a negated comparison flags both bad and out-of-range values
+        bad_no = ~((nos > 0) & np.isfinite(nos))
+        bad_weight = ~(weights >= 0)
+        bad_rate = ~(rates >= 0)
+
         errors = []
-        validated = []
-        for idx, r in enumerate(filtered_rows, start=1):
+        for i in np.flatnonzero(bad_no | ~has_desc | bad_weight | bad_rate):
             row_errs = []
-            # Validate No. (positive integer)
-            try:
-                no_int = int(parse_number(r["No."]))
-                if no_int <= 0:
-                    row_errs.append("No. must be a positive integer.")
-            except Exception:
+            if bad_no[i]:
                 row_errs.append("No. must be a positive integer.")
-
-            # Validate Item Description (non-empty)
-            if not str(r["Item Description"]).strip():
+            if not has_desc[i]:
                 row_errs.append("Item Description cannot be empty.")
-
-            # Validate Weight (non-negative float)
-            try:
-                w = parse_number(r["Weight"])
-                if w < 0:
-                    row_errs.append("Weight must be non-negative.")
-            except Exception:
+            if np.isnan(weights[i]):
                 row_errs.append("Weight must be a number (e.g. 1.25).")
-
-            # Validate Rate (non-negative float)
-            try:
-                rt = parse_number(r["Rate (₹)"])
-                if rt < 0:
-                    row_errs.append("Rate (₹) must be non-negative.")
-            except Exception:
+            elif bad_weight[i]:
+                row_errs.append("Weight must be non-negative.")
+            if np.isnan(rates[i]):
                 row_errs.append("Rate (₹) must be a number (e.g. 45000).")
-
-            # Validate Amount (non-negative float), allow blank and auto-calc
-            amt_val = r["Amount (₹)"]
-            amt_auto = False
-            try:
-                if str(amt_val).strip() == "":
-                    # Try to auto-calculate
-                    amt = parse_number(r["Weight"]) * parse_number(r["Rate (₹)"])
-                    amt_auto = True
-                else:
-                    amt = parse_number(amt_val)
-                if amt < 0:
-                    row_errs.append("Amount (₹) must be non-negative.")
-            except Exception:
-                row_errs.append("Amount (₹) must be a number (e.g. 56250) or left blank for auto-calc.")
-
-            if row_errs:
-                errors.append(f"Row {idx}: " + "; ".join(row_errs))
-            else:
-                validated.append(
-                    {
-                        "No.": str(int(parse_number(r["No."]))),
-                        "Item Description": r["Item Description"].strip(),
-                        "Weight": f"{parse_number(r['Weight']):.2f} {r['Weight Unit']}",
-                        "Rate (₹)": f"{parse_number(r['Rate (₹)']):.2f}",
-                        "Amount (₹)": f"{amt:.2f}",
-                    }
-                )
+            elif bad_rate[i]:
+                row_errs.append("Rate (₹) must be non-negative.")
+            errors.append(f"Row {i + 1}: " + "; ".join(row_errs))
 
         if errors:
             st.error("Please fix these errors before generating the invoice:")
@@ -668,8 +748,23 @@ def main():
                 st.write(f"- {e}")
             return
 
-        # 3) Sort by No.
-        validated.sort(key=lambda x: int(x["No."]))
+        # Amount (₹) = Weight × Rate for every row in one pass
+        amounts = weights * rates
+        validated = []
+        for r, no, w, rt, amt in zip(filtered_rows, nos, weights, rates, amounts):
+            validated.append(
+                {
+                    "No.": str(int(no)),
+                    "Item Description": r["Item Description"].strip(),
+                    "Weight": f"{w:.2f} {r['Weight Unit']}",
+                    "Rate (₹)": f"{rt:.2f}",
+                    "Amount (₹)": f"{amt:.2f}",
+                }
+            )
+
+        # 3) Sort by No. The parsed numbers are already in nos, so order by
+        #    them (stable, like list.sort) instead of re-running int() per row
+        validated = [validated[i] for i in np.argsort(nos, kind="stable")]
 
         # 4) Generate PPTX
         bill_info = {
@@ -684,25 +779,26 @@ def main():
         }
 
         # Calculate net_payable (same as in generate_filled_invoice)
-        amounts = [float(x["Amount (₹)"]) for x in validated]
-        subtotal = sum(amounts)
+        subtotal = math.fsum(float(x["Amount (₹)"]) for x in validated)
         net_payable = float(round(subtotal))
 
         # Get amount in words
         amount_in_words = "Rupees " + num2words(net_payable) + " Only."
 
-        # Show Amount In Words textbox in UI (editable)
+        # Show Amount In Words in the UI, read-only: it is derived from
+        # net_payable, and an edit here could never reach the invoice since
+        # the box only exists while a Generate is being handled
         st.markdown('<div class="subheading">Amount In Words</div>', unsafe_allow_html=True)
-        amount_in_words = st.text_input(
+        st.text_input(
             "Amount In Words",
             value=amount_in_words,
-            key="amount_in_words",
-            help="Amount in words for the invoice. You can edit if needed.",
+            disabled=True,
+            help="Amount in words as printed on the invoice.",
             label_visibility="collapsed",
         )
 
         try:
-            pptx_bytes = generate_filled_invoice(
+            pptx_file = generate_filled_invoice(
                 validated, "invoice_template.pptx", bill_info, payment_method, amount_in_words
             )
         except Exception as e:
@@ -713,7 +809,7 @@ def main():
         filename = re.sub(r'[\\/*?:"<>|]', "", filename)
 
         # Store in session state for use after rerun
-        st.session_state["pptx_bytes"] = pptx_bytes
+        st.session_state["pptx_file"] = pptx_file
         st.session_state["pptx_filename"] = filename
 
         # ← NEW: Upload to Drive
@@ -739,7 +835,7 @@ def main():
                 )
                 print("Uploading PPTX to Drive...")  # Debug
                 pptx_drive_fid = drive.upload_bytes_to_drive(
-                    pptx_bytes,
+                    pptx_file,
                     filename,
                     folder_id,
                 )
@@ -1,55 +1,108 @@
 # drive.py
 
 import io
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseUpload
+import json
+import uuid
+from functools import lru_cache
 
 # 1. CONFIGURATION
 SERVICE_ACCOUNT_FILE = "buoyant-voyage-461916-r8-1e94cd664e30.json"  # ← put your key here
 SCOPES = ["https://www.googleapis.com/auth/drive"]
 FOLDER_NAME = "Tax Invoice"
+# Below this size a single multipart POST beats a resumable upload session
+RESUMABLE_THRESHOLD = 5 * 1024 * 1024
+UPLOAD_URL = "https://www.googleapis.com/upload/drive/v3/files?uploadType=multipart&fields=id"
 
-# 2. AUTHENTICATE
-_creds = service_account.Credentials.from_service_account_file(
-    SERVICE_ACCOUNT_FILE, scopes=SCOPES
-)
-_drive_service = build("drive", "v3", credentials=_creds)
+# 2. AUTHENTICATE (lazily, on the first Drive call)
+@lru_cache(maxsize=None)
+def _svc():
+    """Build the Drive v3 client once; login-only sessions never pay for it."""
+    from google.oauth2 import service_account
+    from googleapiclient.discovery import build
+
+    creds = service_account.Credentials.from_service_account_file(
+        SERVICE_ACCOUNT_FILE, scopes=SCOPES
+    )
+    return build("drive", "v3", credentials=creds)
+
+# Folder IDs found so far; misses are not cached so a newly shared folder is picked up
+_folder_ids: dict[str, str] = {}
 
 def get_folder_id(folder_name: str = FOLDER_NAME) -> str | None:
     """Return the first matching folder ID, or None."""
+    if folder_name in _folder_ids:
+        return _folder_ids[folder_name]
     query = (
         f"name = '{folder_name}' "
         "and mimeType = 'application/vnd.google-apps.folder' "
         "and trashed = false"
     )
-    res = _drive_service.files().list(q=query, fields="files(id)").execute()
+    res = _svc().files().list(q=query, fields="files(id)").execute()
     files = res.get("files", [])
-    return files[0]["id"] if files else None
+    if not files:
+        return None
+    _folder_ids[folder_name] = files[0]["id"]
+    return files[0]["id"]
 
 def upload_bytes_to_drive(
-    file_bytes: bytes,
+    data: bytes | io.BufferedIOBase,
     filename: str,
     folder_id: str,
     mime_type: str = "application/vnd.openxmlformats-officedocument.presentationml.presentation",
 ) -> str:
     """
-    Upload an in-memory byte sequence as a file to Google Drive.
+    Upload an in-memory byte sequence, or a seekable file-like object such
+    as a BytesIO, as a file to Google Drive. File objects are rewound first;
+    small ones are read into the request body, large ones are streamed.
     Returns the new file's Drive ID.
     """
-    fh = io.BytesIO(file_bytes)
-    media = MediaIoBaseUpload(fh, mimetype=mime_type, resumable=True)
+    from googleapiclient.http import MediaIoBaseUpload
+
+    fh = io.BytesIO(data) if isinstance(data, (bytes, bytearray)) else data
+    size = fh.seek(0, io.SEEK_END)
+    fh.seek(0)
     metadata = {"name": filename, "parents": [folder_id]}
-    file = _drive_service.files().create(
+    if size < RESUMABLE_THRESHOLD:
+        payload = data if isinstance(data, (bytes, bytearray)) else fh.read()
+        return _multipart_upload(payload, metadata, mime_type)
+
+    media = MediaIoBaseUpload(fh, mimetype=mime_type, resumable=True)
+    file = _svc().files().create(
         body=metadata, media_body=media, fields="id"
     ).execute()
     return file["id"]
 
+def _multipart_upload(payload: bytes, metadata: dict, mime_type: str) -> str:
+    """
+    Upload metadata + payload in one multipart/related POST, building the body
+    directly as bytes instead of through googleapiclient's email.mime encoder.
+    Returns the new file's Drive ID.
+    """
+    from googleapiclient.errors import HttpError
+
+    boundary = uuid.uuid4().hex
+    body = b"".join((
+        f"--{boundary}\r\nContent-Type: application/json; charset=UTF-8\r\n\r\n".encode(),
+        json.dumps(metadata).encode(),
+        f"\r\n--{boundary}\r\nContent-Type: {mime_type}\r\n\r\n".encode(),
+        payload,
+        f"\r\n--{boundary}--".encode(),
+    ))
+    resp, content = _svc()._http.request(
+        UPLOAD_URL,
+        method="POST",
+        body=body,
+        headers={"Content-Type": f'multipart/related; boundary="{boundary}"'},
+    )
+    if resp.status >= 300:
+        raise HttpError(resp, content, uri=UPLOAD_URL)
+    return json.loads(content)["id"]
+
 def export_drive_file_as_pdf(file_id: str) -> bytes:
     """
     Export a Google Slides file as PDF and return the PDF bytes.
     """
-    request = _drive_service.files().export_media(
+    request = _svc().files().export_media(
         fileId=file_id,
         mimeType="application/pdf"
     )
@@ -66,7 +119,7 @@ def convert_pptx_to_slides(file_id, filename, folder_id):
         'mimeType': 'application/vnd.google-apps.presentation',
         'parents': [folder_id],
     }
-    slides_file = _drive_service.files().copy(
+    slides_file = _svc().files().copy(
         fileId=file_id,
         body=body
     ).execute()
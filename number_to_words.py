@@ -1,5 +1,7 @@
 import decimal    
+from functools import lru_cache
 
+@lru_cache(maxsize=4096)
 def num2words(num):
     num = decimal.Decimal(num)
     decimal_part = num - int(num)